@@ -9,7 +9,9 @@ from pathlib import Path
 # ===========================================================================
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def main():
@@ -32,12 +34,21 @@ def main():
     try:
         # Open image
         image = Image.open(input_path)
+        source_format = (image.format or "").lower()
         original_size = os.path.getsize(input_path)
         log(f"Status: Loaded image ({image.size[0]}x{image.size[1]}, mode={image.mode})")
 
-        # Determine output format
+        # Determine output format. "auto" prefers WebP: 25-35% smaller than
+        # JPEG at matched quality, and lossless WebP beats PNG. Animated
+        # GIFs keep their format (frame fidelity beats size there).
         if target_format == "auto":
-            target_format = input_path.split(".")[-1].lower()
+            if getattr(image, "is_animated", False):
+                target_format = source_format or input_path.split(".")[-1].lower()
+            else:
+                target_format = "webp"
+            if not output_path.lower().endswith("." + target_format):
+                output_path = output_path.rsplit(".", 1)[0] + "." + target_format
+            log(f"Status: Auto format selected - {target_format.upper()}")
         
         # Quality settings
         if level == "extreme":
@@ -51,6 +62,19 @@ def main():
             progressive = True
             log("Mode: BALANCED - Quality preserved")
 
+        # Downscale oversized images first - file size scales with pixel
+        # count squared, so this is where the big wins live. 24MP phone
+        # photos don't need to stay 24MP for web use.
+        max_dim = 1600 if level == "extreme" else 3000
+        if max(image.size) > max_dim:
+            image.thumbnail((max_dim, max_dim), Image.LANCZOS)
+            log(f"Status: Downscaled to {image.size[0]}x{image.size[1]}")
+
+        # Extreme PNG: drop to a 256-color palette (octree is the fast path)
+        if level == "extreme" and target_format == "png" and image.mode in ("RGB", "RGBA"):
+            image = image.quantize(colors=256, method=Image.FASTOCTREE)
+            log("Status: Quantized to 256-color palette")
+
         # Convert RGBA to RGB if saving as JPG
         if target_format in ["jpg", "jpeg"] and image.mode == "RGBA":
             rgb_image = Image.new("RGB", image.size, (255, 255, 255))
@@ -65,7 +89,11 @@ def main():
         elif target_format == "png":
             image.save(output_path, "PNG", optimize=optimize)
         elif target_format == "webp":
-            image.save(output_path, "WEBP", quality=quality, method=6)
+            if source_format == "png":
+                # Lossless sources stay lossless; still smaller than PNG
+                image.save(output_path, "WEBP", lossless=True, quality=100, method=6)
+            else:
+                image.save(output_path, "WEBP", quality=quality, method=6)
         elif target_format == "gif":
             image.save(output_path, "GIF", optimize=optimize)
         else:
@@ -3,11 +3,14 @@ import sys
 import fitz  # PyMuPDF
 from PIL import Image
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 def log(message):
     """Sends real-time updates to Node.js backend"""
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def main():
@@ -38,38 +41,43 @@ def main():
         # Step 2: Optimize images & handle grayscale
         if original_pages > 0:
             log("Process: Optimizing image streams...")
-            
-            for page_num in range(original_pages):
-                page = doc[page_num]
-                
-                # Get all images in page
-                images = page.get_images()
-                if images:
-                    log(f"Process: Compressing {len(images)} images on page {page_num + 1}...")
-                    
-                    for img_index in images:
-                        try:
-                            xref = img_index[0]
-                            pix = fitz.Pixmap(doc, xref)
-                            
-                            # Apply grayscale if requested
-                            if grayscale and pix.colorspace.n > 1:
-                                gray_pix = fitz.Pixmap(fitz.csGRAY, pix)
-                                
-                                # Compress with JPEG quality=85
-                                img_data = gray_pix.tobytes("jpeg", 85)
-                                doc.update_stream(xref, img_data)
-                                gray_pix = None
-                            elif not grayscale:
-                                # Lossy JPEG compression at quality 88 for color images
-                                if pix.n - pix.alpha > 1:  # Has color
-                                    img_data = pix.tobytes("jpeg", 88)
-                                    doc.update_stream(xref, img_data)
-                            
-                            pix = None
-                        except Exception as img_err:
-                            log(f"Warning: Could not optimize image {img_index}: {str(img_err)}")
-                            continue
+
+            # Walk the xref table once instead of loading every page and
+            # calling get_images(): O(unique images) instead of
+            # O(pages x imgs/page), and each xref is decoded exactly once
+            # even when a header/footer image repeats on 50 pages.
+            xrefs = []
+            for xref in range(1, doc.xref_length()):
+                if doc.xref_get_key(xref, "Subtype")[1] == "/Image":
+                    xrefs.append(xref)
+
+            def recode(xref):
+                """JPEG-encode one image stream. libjpeg releases the GIL,
+                so threads scale this near-linearly with cores."""
+                try:
+                    pix = fitz.Pixmap(doc, xref)
+                    if grayscale:
+                        if pix.colorspace.n > 1:
+                            pix = fitz.Pixmap(fitz.csGRAY, pix)
+                        # Compress with JPEG quality=85 (no extra
+                        # colorspace pass when already single-channel)
+                        return xref, pix.tobytes("jpg", jpg_quality=85)
+                    # Lossy JPEG compression at quality 88 for color images
+                    if pix.n - pix.alpha > 1:  # Has color
+                        return xref, pix.tobytes("jpg", jpg_quality=88)
+                    return xref, None
+                except Exception as img_err:
+                    log(f"Warning: Could not optimize image {xref}: {str(img_err)}")
+                    return xref, None
+
+            if xrefs:
+                log(f"Process: Compressing {len(xrefs)} unique images...")
+                # Encode in parallel; write back on the main thread only,
+                # since the fitz document is not safe to mutate concurrently.
+                with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as ex:
+                    for xref, img_data in ex.map(recode, xrefs):
+                        if img_data:
+                            doc.update_stream(xref, img_data)
         
         # Step 3: Remove metadata if requested
         if strip_meta:
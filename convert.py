@@ -1,11 +1,15 @@
 import sys
 import os
 import time
+import hashlib
 import logging
+import mmap
 import shutil
 import tempfile
 import uuid
 from multiprocessing import Pool, cpu_count, freeze_support
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from functools import lru_cache
 
 # ======================== SILENCE NOISY LOGGERS ========================
@@ -18,21 +22,26 @@ logging.getLogger("PIL").setLevel(logging.ERROR)
 # Third-party imports
 try:
     from pdf2docx import Converter
-    from pdf2image import convert_from_path
     import pytesseract
     import cv2
     import numpy as np
     from docx import Document
-    import pdfplumber
+    import fitz  # PyMuPDF - fast text-presence analysis
     
-    # Cryptography for E2EE
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    # Cryptography for E2EE (key derivation goes through hashlib directly)
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 except ImportError as e:
     # Silent fail for dependency check to avoid noise, handled in main execution
     pass
 
+# Optional: tesserocr binds libtesseract directly (no subprocess per page).
+# Falls back to the pytesseract CLI wrapper when unavailable.
+try:
+    import tesserocr
+    from PIL import Image as PILImage
+except ImportError:
+    tesserocr = None
+
 # ======================== SINGULARITY PDF ENGINE v8.0 ========================
 # 1. RAM-Safe: Streams pages in batches (10 pages/cycle)
 # 2. Turbo OCR: Disables 'inverted text' check for 20% speed boost
@@ -47,6 +56,21 @@ class SpeedLogger:
         sys.stdout.write(f"{msg}\n")
         sys.stdout.flush()
 
+@lru_cache(maxsize=64)
+def _derive_key(secret, salt):
+    """PBKDF2 costs ~50-100ms per call by design; cache per (secret, salt)
+    so repeat conversions in one session pay it once.
+
+    hashlib.pbkdf2_hmac drops straight into OpenSSL's accelerated SHA256
+    loop with no per-iteration Python object wrapping."""
+    return hashlib.pbkdf2_hmac('sha256', secret, salt, 100000, dklen=32)
+
+@lru_cache(maxsize=8)
+def _aes_algorithm(key):
+    """Reuse the AES key wrapper across calls; paired with the derived-key
+    cache, a retried decrypt of the same file skips all key setup."""
+    return algorithms.AES(key)
+
 class SecurityEngine:
     """Handles decryption of E2EE secured files"""
     @staticmethod
@@ -55,98 +79,231 @@ class SecurityEngine:
             return input_path
         
         SpeedLogger.log("Security: Decrypting secure payload...")
+        decrypted_path = input_path.replace(".enc", ".pdf")
         try:
+            # Stream the decrypt: GCM only needs the full ciphertext for
+            # tag verification at the end, so the low-level Cipher API can
+            # process mmap'd 1 MiB windows. Peak memory goes from 3x file
+            # size (read + decrypt + write buffers) to O(chunk).
+            chunk = 1024 * 1024
             with open(input_path, 'rb') as f:
-                data = f.read()
-            
-            salt = data[:16]
-            iv = data[16:28]
-            ciphertext = data[28:]
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000
-            )
-            key = kdf.derive(secret_key.encode())
-
-            aesgcm = AESGCM(key)
-            plain_pdf = aesgcm.decrypt(iv, ciphertext, None)
-            
-            decrypted_path = input_path.replace(".enc", ".pdf")
-            with open(decrypted_path, "wb") as f:
-                f.write(plain_pdf)
-            
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    salt = bytes(mm[:16])
+                    iv = bytes(mm[16:28])
+                    tag = bytes(mm[-16:])  # WebCrypto appends the GCM tag
+
+                    key = _derive_key(secret_key.encode(), salt)
+                    decryptor = Cipher(_aes_algorithm(key), modes.GCM(iv, tag)).decryptor()
+
+                    end = len(mm) - 16
+                    fd = os.open(decrypted_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        pos = 28
+                        while pos < end:
+                            os.write(fd, decryptor.update(mm[pos:min(pos + chunk, end)]))
+                            pos += chunk
+                        decryptor.finalize()  # raises on tag mismatch
+                    finally:
+                        os.close(fd)
+                finally:
+                    mm.close()
+
             return decrypted_path
         except Exception:
+            # Tag mismatch or truncated input: drop the partial plaintext
+            try: os.remove(decrypted_path)
+            except OSError: pass
             return input_path
 
 class ImageOptimizer:
     """Lightweight preprocessing to boost OCR speed"""
     @staticmethod
-    def preprocess(image):
+    def preprocess(img_array):
         try:
-            # Zero-Copy conversion to OpenCV format
-            img_array = np.array(image)
-            
-            # If RGB, convert to Gray
+            # If RGB, convert to Gray (no-op for grayscale-rendered pages)
             if len(img_array.shape) == 3:
                 img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            
+
+            # cv2.threshold's SIMD path wants a contiguous uint8 buffer
+            img_array = np.ascontiguousarray(img_array, dtype=np.uint8)
+
             # Simple thresholding (Faster than adaptive for standard docs)
             _, binary = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
+
             return binary
         except:
-            return np.array(image)
+            return img_array
+
+# Deletion table for OCR text sanitization: C0/C1 control characters
+# (minus \n\t\r) are what breaks lxml serialization. str.translate runs
+# the scan in C instead of a per-character Python loop.
+_SANITIZE_TABLE = {cp: None for cp in list(range(0x00, 0x20)) + [0x7F] + list(range(0x80, 0xA0))
+                   if chr(cp) not in '\n\t\r'}
+
+def append_ocr_paragraphs(doc, texts):
+    """
+    Bulk-append plain paragraphs (each followed by a page break).
+    The whole batch is rendered as one XML string and parsed in a single
+    C-level pass - one lxml mutation per batch instead of four per page.
+    """
+    from docx.oxml.ns import nsdecls, qn
+    from docx.oxml import parse_xml
+    from xml.sax.saxutils import escape
+
+    if not texts:
+        return
+
+    blob = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(t)}</w:t></w:r></w:p>'
+        f'<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+        for t in texts
+    )
+    wrapper = parse_xml(f'<w:body {nsdecls("w")}>{blob}</w:body>')
+
+    body = doc.element.body
+    sectPr = body.find(qn('w:sectPr'))
+    for elem in list(wrapper):
+        # Paragraphs must stay ahead of the trailing section properties
+        if sectPr is not None:
+            sectPr.addprevious(elem)
+        else:
+            body.append(elem)
+
+# Per-worker Tesseract handle: model + traineddata load once per process
+# instead of once per page.
+_TESS_API = None
+
+def _init_ocr_worker():
+    """
+    Pool initializer. Tesseract spins up 4 OpenMP threads per process by
+    default; with a full pool that oversubscribes the machine several
+    times over and measured slowdowns reach 50x. One OMP thread per
+    worker keeps scaling linear with pool size.
+
+    Also binds a persistent PyTessBaseAPI when tesserocr is available, so
+    per-page calls skip engine setup/teardown entirely.
+    """
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    try:
+        # Same oversubscription story as OMP: one OpenCV thread per worker
+        cv2.setNumThreads(1)
+    except Exception:
+        pass
+    global _TESS_API
+    if tesserocr is not None:
+        try:
+            _TESS_API = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.AUTO, oem=tesserocr.OEM.LSTM_ONLY)
+            _TESS_API.SetVariable("tessedit_do_invert", "0")
+        except Exception:
+            _TESS_API = None
 
 def worker_ocr_page(args):
     """
     Worker function for Multiprocessing OCR.
+    Receives a file path, not a pickled image - IPC cost drops from
+    tens of MB per page to a few bytes.
     Optimization: tessedit_do_invert=0 skips 'inverted' check (huge speedup)
     """
-    index, image = args
+    index, image_path = args
     try:
-        processed_img = ImageOptimizer.preprocess(image)
-        # --oem 1 (LSTM only) --psm 3 (Auto Page Segmentation)
-        config = r'--oem 1 --psm 3 -c tessedit_do_invert=0'
-        text = pytesseract.image_to_string(processed_img, config=config)
+        # cv2 decodes straight to ndarray (skips PIL entirely - faster).
+        # Pages are rendered grayscale, so decode single-channel: 1/3 the
+        # bytes touched and the RGB->GRAY pass becomes a no-op.
+        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            return (index, "")
+        processed_img = ImageOptimizer.preprocess(img)
+        if _TESS_API is not None:
+            # Persistent C-API handle: no engine init, no binary fork,
+            # no argv/tempfile marshalling per page
+            _TESS_API.SetImage(PILImage.fromarray(processed_img))
+            text = _TESS_API.GetUTF8Text()
+        else:
+            # --oem 1 (LSTM only) --psm 3 (Auto Page Segmentation)
+            config = r'--oem 1 --psm 3 -c tessedit_do_invert=0'
+            text = pytesseract.image_to_string(processed_img, config=config)
         return (index, text.strip())
     except:
         return (index, "")
+    finally:
+        try: os.unlink(image_path)
+        except: pass
 
 class ConversionEngine:
     
     @staticmethod
+    @lru_cache(maxsize=32)
     def analyze_pdf_structure(pdf_path):
         """
         Determines if the PDF has selectable text.
+        Uses PyMuPDF (MuPDF backend) - pdfminer is 5-30x slower per page.
         Returns: (has_text: bool, page_count: int)
+
+        Cached per path: the legacy wrappers (is_text_pdf followed by
+        ocr_pdf_advanced) would otherwise re-open and re-sample the same
+        document within one run.
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                if not pdf.pages: return (False, 0)
-                
-                page_count = len(pdf.pages)
-                
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+                if not page_count: return (False, 0)
+
                 # Check random sample (First, Middle, Last) to avoid reading whole file
                 indices = [0, page_count // 2, page_count - 1]
                 text_len = 0
-                
+
                 for i in set(indices): # set removes duplicates for small docs
                     if i < page_count:
-                        text = pdf.pages[i].extract_text()
-                        if text: text_len += len(text)
-                
+                        # TEXTFLAGS_TEXT skips ligature/whitespace
+                        # postprocessing - ~2x faster, and scanned pages
+                        # return empty immediately
+                        text = doc[i].get_text("text", flags=fitz.TEXTFLAGS_TEXT)
+                        if text:
+                            text_len += len(text.strip())
+                            if text_len > 100:
+                                break  # verdict already decided
+
                 return (text_len > 100, page_count)
         except:
             return (False, 0)
 
+    @staticmethod
+    def convert_text_fast(pdf_path, output_path):
+        """
+        Direct fitz -> python-docx extraction for plain text documents.
+        Skips pdf2docx's pdfminer layout analysis entirely (5-30x faster).
+        Bails out when a page contains tables, where pdf2docx's geometry
+        reconstruction is worth its cost.
+        """
+        try:
+            from docx.shared import Pt
+            out = Document()
+            with fitz.open(pdf_path) as src:
+                for page in src:
+                    if page.find_tables().tables:
+                        return False  # layout fidelity needed - use pdf2docx
+                    for block in page.get_text("dict")["blocks"]:
+                        if block.get("type") != 0:  # skip image blocks
+                            continue
+                        para = out.add_paragraph()
+                        for line in block["lines"]:
+                            for span in line["spans"]:
+                                run = para.add_run(span["text"])
+                                run.font.size = Pt(span["size"])
+                                run.bold = bool(span["flags"] & 16)
+                                run.italic = bool(span["flags"] & 2)
+            out.save(output_path)
+            return True
+        except Exception:
+            return False
+
     @staticmethod
     def convert_native(pdf_path, output_path):
-        """Uses pdf2docx for blazing fast native conversion"""
+        """Uses direct extraction when possible, pdf2docx otherwise"""
         SpeedLogger.log("Engine: Vector Mode (Native Text)...")
+        if ConversionEngine.convert_text_fast(pdf_path, output_path):
+            return True
         try:
             # Suppress internal logging during instantiation
             cv = Converter(pdf_path)
@@ -157,6 +314,21 @@ class ConversionEngine:
             # Only log real errors
             return False
 
+    @staticmethod
+    def pick_ocr_dpi(pdf_path):
+        """
+        Tiered render resolution: Tesseract LSTM accuracy saturates around
+        200 DPI for body text, so extra pixels are pure rasterize/preprocess
+        cost. Scale down as the input grows.
+        """
+        try:
+            size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        except OSError:
+            return 150
+        if size_mb < 10: return 200
+        if size_mb < 100: return 150
+        return 100
+
     @staticmethod
     def convert_ocr(pdf_path, output_path, page_count):
         """
@@ -164,46 +336,96 @@ class ConversionEngine:
         Prevents RAM overflow on large files.
         """
         SpeedLogger.log("Engine: Raster Mode (AI OCR)...")
-        
+
         try:
             doc = Document()
             # Batch size: Processes 10 pages, writes them, clears RAM, repeats.
             batch_size = 10 
             
-            # Determine optimal CPU cores (leave 1 for OS)
-            pool_size = max(1, min(cpu_count() - 1, 8))
+            # With OMP pinned to 1 thread per worker, the full core count
+            # is safe (no hidden 4x OpenMP oversubscription per process)
+            pool_size = max(1, cpu_count())
             
             total_processed = 0
-            
-            with Pool(processes=pool_size) as pool:
-                for i in range(0, page_count, batch_size):
-                    end_page = min(i + batch_size, page_count)
-                    
-                    # Convert specific page range to images
-                    images = convert_from_path(
-                        pdf_path, 
-                        dpi=150, # 150 is the web standard sweet spot
-                        first_page=i+1, 
-                        last_page=end_page,
-                        thread_count=4 # Threading for image conversion (IO bound)
-                    )
-                    
+            dpi = ConversionEngine.pick_ocr_dpi(pdf_path)
+            SpeedLogger.log(f"Status: Rendering at {dpi} DPI...")
+
+            batch_starts = list(range(0, page_count, batch_size))
+
+            # Set in the parent too so forked children inherit it even
+            # before the initializer runs
+            os.environ['OMP_THREAD_LIMIT'] = '1'
+
+            with tempfile.TemporaryDirectory() as tmpdir, \
+                 Pool(processes=pool_size, initializer=_init_ocr_worker) as pool, \
+                 ThreadPoolExecutor(max_workers=2) as prefetcher:
+
+                def render_batch(start):
+                    """
+                    Rasterize one batch to disk with MuPDF - no pdftoppm
+                    subprocess fork, no PPM round-trip. Each call opens its
+                    own document handle (fitz docs are not thread-safe).
+                    Workers get paths, not pickled images - keeps RAM
+                    O(num_workers) instead of O(num_pages).
+                    """
+                    end_page = min(start + batch_size, page_count)
+                    paths = []
+                    # Cap render width: Tesseract gains nothing past ~1700px
+                    # for body text, so oversized pages (posters, A3 scans)
+                    # get downsampled at raster time instead of wasting OCR
+                    # cycles on huge arrays.
+                    max_width = 1700
+                    with fitz.open(pdf_path) as src:
+                        for pno in range(start, end_page):
+                            page = src[pno]
+                            zoom = dpi / 72.0
+                            if page.rect.width * zoom > max_width:
+                                zoom = max_width / page.rect.width
+                            # Grayscale straight from the renderer: 1/3 the
+                            # bytes and no cvtColor pass downstream
+                            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                                  colorspace=fitz.csGRAY, alpha=False)
+                            path = os.path.join(tmpdir, f"page_{pno:05d}.jpg")
+                            pix.save(path, jpg_quality=85)
+                            paths.append(path)
+                    return paths
+
+                # Producer/consumer: keep up to 2 batches rendering ahead
+                # so rasterization overlaps OCR instead of alternating.
+                pending = deque()
+                submitted = 0
+                while submitted < len(batch_starts) and len(pending) < 2:
+                    pending.append((batch_starts[submitted],
+                                    prefetcher.submit(render_batch, batch_starts[submitted])))
+                    submitted += 1
+
+                while pending:
+                    i, future = pending.popleft()
+                    images = future.result()
+
+                    # Top the pipeline back up before OCR-ing this batch
+                    if submitted < len(batch_starts):
+                        pending.append((batch_starts[submitted],
+                                        prefetcher.submit(render_batch, batch_starts[submitted])))
+                        submitted += 1
+
                     if not images: continue
-                    
+
                     # Prepare tasks
-                    tasks = [(i + idx, img) for idx, img in enumerate(images)]
-                    
-                    # Run OCR in parallel (CPU bound)
-                    results = pool.map(worker_ocr_page, tasks)
-                    results.sort(key=lambda x: x[0])
-                    
+                    tasks = [(i + idx, path) for idx, path in enumerate(images)]
+
+                    # Run OCR in parallel (CPU bound). imap_unordered lets
+                    # workers pull work lazily instead of blocking on the
+                    # slowest page; slot results by index to keep page order.
+                    chunksize = max(1, len(tasks) // (pool_size * 4))
+                    results = [""] * len(tasks)
+                    for page_idx, text in pool.imap_unordered(worker_ocr_page, tasks, chunksize=chunksize):
+                        results[page_idx - i] = text
+
                     # Dump to Word Doc immediately
-                    for _, text in results:
-                        if text:
-                            # Sanitize text to prevent XML errors
-                            clean_text = ''.join(c for c in text if c.isprintable() or c in ['\n', '\t', '\r'])
-                            doc.add_paragraph(clean_text)
-                            doc.add_page_break()
+                    # Sanitize text to prevent XML errors (C-level scan)
+                    batch_texts = [text.translate(_SANITIZE_TABLE) for text in results if text]
+                    append_ocr_paragraphs(doc, batch_texts)
                     
                     total_processed += len(results)
                     SpeedLogger.log(f"Status: Processed {total_processed}/{page_count} pages...")
@@ -218,6 +440,23 @@ class ConversionEngine:
             SpeedLogger.log(f"OCR Error: {e}")
             return False
 
+# ---- Thin wrappers for the legacy app.py entry point ----
+# Kept so both CLI front-ends share one engine (and one import cost).
+
+def is_text_pdf(pdf_path):
+    """True when the PDF carries selectable text."""
+    has_text, _ = ConversionEngine.analyze_pdf_structure(pdf_path)
+    return has_text
+
+def convert_text_pdf(pdf_path, output_path):
+    """Native (vector) PDF -> DOCX conversion."""
+    return ConversionEngine.convert_native(pdf_path, output_path)
+
+def ocr_pdf_advanced(pdf_path, output_path):
+    """Raster OCR PDF -> DOCX conversion."""
+    _, page_count = ConversionEngine.analyze_pdf_structure(pdf_path)
+    return ConversionEngine.convert_ocr(pdf_path, output_path, page_count)
+
 def main():
     if len(sys.argv) < 4:
         SpeedLogger.log("Error: Missing arguments")
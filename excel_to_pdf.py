@@ -5,7 +5,9 @@ import platform
 
 def log(message):
     """Sends real-time updates to Node.js backend"""
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def convert_windows(input_path, output_path):
@@ -29,6 +31,22 @@ def convert_windows(input_path, output_path):
         log(f"Aspose Error: {str(e)}")
         return False
 
+def convert_with_daemon(input_path, output_path):
+    """Warm path: reuse the persistent LibreOffice UNO listener instead
+    of paying soffice startup per conversion. Returns True on success."""
+    try:
+        import uno  # noqa: F401 - only in LibreOffice-bundled pythons
+    except ImportError:
+        return False
+    try:
+        from office_engine import UnoService
+        log("Status: Utilizing warm LibreOffice daemon...")
+        return (UnoService.ensure_listener()
+                and UnoService.convert(input_path, output_path,
+                                       filter_name='calc_pdf_Export'))
+    except Exception:
+        return False
+
 def convert_linux(input_path, output_dir):
     """Linux specific conversion using LibreOffice (soffice)"""
     try:
@@ -37,7 +55,7 @@ def convert_linux(input_path, output_dir):
         process = subprocess.run([
             'soffice',
             '--headless',
-            '--convert-to', 'pdf',
+            '--convert-to', 'pdf:calc_pdf_Export',
             '--outdir', output_dir,
             input_path
         ], capture_output=True, text=True)
@@ -66,8 +84,10 @@ def main():
     success = False
     if current_os == "Windows":
         success = convert_windows(input_path, output_path)
+    elif convert_with_daemon(input_path, output_path):
+        success = True
     else:
-        # LibreOffice automatically names the file. 
+        # LibreOffice automatically names the file.
         # We ensure it lands in the right directory.
         success = convert_linux(input_path, output_dir)
         
@@ -77,8 +97,7 @@ def main():
         generated_path = os.path.join(output_dir, generated_name)
         
         if success and os.path.exists(generated_path) and generated_path != output_path:
-            if os.path.exists(output_path): os.remove(output_path)
-            os.rename(generated_path, output_path)
+            os.replace(generated_path, output_path)
 
     if success:
         log("Success: Excel converted to high-fidelity PDF.")
@@ -2,7 +2,6 @@ import os
 import sys
 import img2pdf
 from PIL import Image, ImageOps, ImageEnhance
-from concurrent.futures import ThreadPoolExecutor
 
 # ======================== OPTIMIZATION FEATURES ========================
 # 1. Auto-rotation detection & correction (EXIF-based)
@@ -14,13 +13,28 @@ from concurrent.futures import ThreadPoolExecutor
 # 7. Progress tracking & real-time updates
 # =========================================================================
 
-executor = ThreadPoolExecutor(max_workers=4)
-
 def log(message):
     """Real-time logging to Node.js backend"""
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
+def can_skip_optimization(img):
+    """
+    Clean photos need no pixel work: already JPEG/PNG, RGB, upright EXIF
+    orientation and reasonably sized. img2pdf embeds such files byte-for-
+    byte, so skipping saves a full decode+filter+encode roundtrip.
+    """
+    try:
+        exif_orientation = img.getexif().get(274, 1)
+        return (img.format in ('JPEG', 'PNG')
+                and img.mode == 'RGB'
+                and exif_orientation == 1
+                and max(img.size) <= 4000)
+    except Exception:
+        return False
+
 def optimize_image_for_pdf(image_path):
     """
     Preprocesses image for optimal PDF output:
@@ -94,10 +108,15 @@ def main():
             width, height = img.size
             dpi = img.info.get('dpi', (72, 72))
             log(f"Status: Detected {img_format} ({width}x{height}px, {dpi[0]}dpi)")
+            skip_optimization = can_skip_optimization(img)
 
-        # Optimize for PDF
-        log("Process: Optimizing image for PDF...")
-        optimized_path = optimize_image_for_pdf(input_path)
+        # Optimize for PDF (clean photos embed as-is - zero pixel work)
+        if skip_optimization:
+            log("Process: Image already PDF-ready - skipping optimization...")
+            optimized_path = input_path
+        else:
+            log("Process: Optimizing image for PDF...")
+            optimized_path = optimize_image_for_pdf(input_path)
 
         # Convert to PDF
         log("Process: Generating PDF container...")
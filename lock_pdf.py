@@ -3,7 +3,9 @@ import sys
 import pikepdf
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def main():
@@ -1,6 +1,9 @@
 import os
 import sys
+import mmap
 import fitz  # PyMuPDF
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from pathlib import Path
 
 # ======================== ADVANCED MERGE ENGINE v2.0 ========================
@@ -19,7 +22,9 @@ MAX_TOTAL_SIZE = 500 * 1024 * 1024  # 500MB
 
 def log(message):
     """Real-time logging to Node.js backend"""
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def validate_pdf(file_path):
@@ -30,16 +35,31 @@ def validate_pdf(file_path):
     except:
         return False, 0
 
+def consecutive_runs(pages):
+    """Group sorted page numbers into (lo, hi) inclusive runs so each run
+    needs only one insert_pdf call"""
+    runs = []
+    for offset, group in groupby(enumerate(pages), key=lambda x: x[1] - x[0]):
+        members = [page for _, page in group]
+        runs.append((members[0], members[-1]))
+    return runs
+
+def is_blank_page(page):
+    """Cheap emptiness probe: bail at the first text block instead of
+    assembling the page's full glyph string; image-only pages count as
+    content too"""
+    for _ in page.get_textpage().extractBLOCKS():
+        return False
+    return not page.get_images(full=False)
+
 def optimize_for_merging(doc):
     """Remove duplicate pages and optimize document"""
     try:
         # Remove empty/blank pages (optional)
         pages_to_keep = []
         for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            # Keep page if it has content or is not blank
-            if text.strip() or page_num == 0:  # Always keep first page
+            # Always keep first page
+            if page_num == 0 or not is_blank_page(doc[page_num]):
                 pages_to_keep.append(page_num)
         return pages_to_keep
     except:
@@ -57,33 +77,42 @@ def main():
     log("Process: Initializing Advanced Merge Engine v2.0...")
 
     try:
-        # Validate all input files first
+        # Validate all input files first. Size accounting stays serial
+        # (stat calls are cheap); the header-parse validation overlaps
+        # across files since MuPDF releases the GIL during I/O.
         log("Process: Validating input files...")
-        valid_files = []
-        total_pages = 0
+        existing_files = []
         total_size = 0
-        
+
         for i, file_path in enumerate(input_files):
             # Check file exists and size
             if not os.path.exists(file_path):
                 log(f"Warning: File {i+1} not found - {file_path}")
                 continue
-            
+
             file_size = os.path.getsize(file_path)
             total_size += file_size
-            
+
             # Check 500MB limit
             if total_size > MAX_TOTAL_SIZE:
                 log(f"Error: Total size ({total_size >> 20}MB) exceeds 500MB limit")
                 sys.exit(1)
-            
-            is_valid, page_count = validate_pdf(file_path)
-            if is_valid:
-                valid_files.append((file_path, page_count, file_size))
-                total_pages += page_count
-                log(f"Status: File {i+1} validated ({page_count} pages, {file_size >> 20}MB)")
-            else:
-                log(f"Warning: Skipping invalid file {i+1} - {file_path}")
+
+            existing_files.append((i, file_path, file_size))
+
+        valid_files = []
+        total_pages = 0
+
+        if existing_files:
+            with ThreadPoolExecutor(max_workers=min(32, len(existing_files))) as ex:
+                checks = ex.map(validate_pdf, [fp for _, fp, _ in existing_files])
+                for (i, file_path, file_size), (is_valid, page_count) in zip(existing_files, checks):
+                    if is_valid:
+                        valid_files.append((file_path, page_count, file_size))
+                        total_pages += page_count
+                        log(f"Status: File {i+1} validated ({page_count} pages, {file_size >> 20}MB)")
+                    else:
+                        log(f"Warning: Skipping invalid file {i+1} - {file_path}")
         
         if len(valid_files) < 2:
             raise ValueError("Need at least 2 valid PDF files to merge")
@@ -93,30 +122,64 @@ def main():
         # Create destination PDF
         result = fitz.open()
         
+        def merge_one(m_file):
+            """Append one open document to the result; returns pages added"""
+            n_pages = len(m_file)
+
+            # The blank-page scan reads text from every page; below
+            # ~500 pages it costs more than the blanks it would drop.
+            if n_pages < 500:
+                pages_to_insert = list(range(n_pages))
+            else:
+                pages_to_insert = optimize_for_merging(m_file)
+
+            # insert_pdf rebuilds object graphs per call - one call
+            # per consecutive run instead of one per page.
+            if len(pages_to_insert) == n_pages:
+                result.insert_pdf(m_file)
+            else:
+                for lo, hi in consecutive_runs(pages_to_insert):
+                    result.insert_pdf(m_file, from_page=lo, to_page=hi)
+            return len(pages_to_insert)
+
         current_page = 0
         for idx, (file_path, page_count, file_size) in enumerate(valid_files):
             try:
-                with fitz.open(file_path) as m_file:
-                    # Get pages to keep (skip blank pages)
-                    pages_to_insert = optimize_for_merging(m_file)
-                    
-                    for page_num in pages_to_insert:
-                        result.insert_pdf(m_file, from_page=page_num, to_page=page_num)
-                        current_page += 1
-                    
-                    log(f"Status: Merged document {idx+1}/{len(valid_files)} ({len(pages_to_insert)} pages, {file_size >> 20}MB)")
+                # mmap-backed open: the OS page cache services MuPDF's
+                # random xref seeks instead of a full heap read of the
+                # file - matters when inputs approach the 500MB cap.
+                # The document must be dropped before the mmap closes,
+                # since it keeps the buffer exported until collected.
+                with open(file_path, 'rb') as fp, \
+                     mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    m_file = fitz.open(stream=memoryview(mm), filetype='pdf')
+                    try:
+                        inserted = merge_one(m_file)
+                    finally:
+                        m_file.close()
+                        del m_file
+
+                current_page += inserted
+                log(f"Status: Merged document {idx+1}/{len(valid_files)} ({inserted} pages, {file_size >> 20}MB)")
             except Exception as e:
                 log(f"Warning: Error merging file {idx+1} - {str(e)}")
                 continue
         
-        # Optimize output
+        # Optimize output. Linearization forces a second whole-file
+        # reordering pass for a fast-first-page property downloads never
+        # benefit from, so it stays off; spend that time compressing
+        # image/font streams and packing objects into object streams
+        # (typically another 10-20% smaller).
         log("Process: Optimizing merged document...")
         result.save(
             output_path,
-            garbage=4,           # Remove unused objects
-            deflate=True,        # Compress streams
-            clean=True,          # Clean cross-references
-            linear=True          # Linearize for web view
+            garbage=4,             # Remove unused objects
+            deflate=True,          # Compress streams
+            deflate_images=True,   # Recompress image streams
+            deflate_fonts=True,    # Compress font binaries
+            clean=True,            # Clean cross-references
+            linear=False,          # Skip web-view reordering pass
+            use_objstms=1          # Pack objects into compressed streams
         )
         
         final_size = os.path.getsize(output_path)
@@ -1,5 +1,6 @@
 import os
 import sys
+import shutil
 import easyocr
 import cv2
 import numpy as np
@@ -20,60 +21,153 @@ from functools import lru_cache
 logging.getLogger('easyocr').setLevel(logging.ERROR)
 logging.getLogger('torch').setLevel(logging.ERROR)
 
+# Let OpenCV dispatch CLAHE/blur to its IPP/SIMD and OpenCL paths when
+# the hardware has them
+cv2.setUseOptimized(True)
+cv2.ocl.setUseOpenCL(True)
+
 executor = ThreadPoolExecutor(max_workers=2)
 
+_SHM_MODEL_DIR = '/dev/shm/easyocr_models'
+
+def _ram_model_dir():
+    """
+    Mirror the downloaded EasyOCR weights into /dev/shm once so every
+    fresh process streams CRAFT + recognizer weights out of RAM instead
+    of re-reading hundreds of MB from disk. lru_cache only helps within
+    one process; this helps across the per-job processes Node spawns.
+    Returns None (default on-disk cache) when tmpfs or the weights are
+    unavailable.
+    """
+    src = os.path.join(os.path.expanduser('~'), '.EasyOCR', 'model')
+    if not os.path.isdir('/dev/shm') or not os.path.isdir(src):
+        return None
+    try:
+        os.makedirs(_SHM_MODEL_DIR, exist_ok=True)
+        for name in os.listdir(src):
+            dst = os.path.join(_SHM_MODEL_DIR, name)
+            if not os.path.exists(dst):
+                shutil.copy2(os.path.join(src, name), dst)
+        return _SHM_MODEL_DIR
+    except OSError:
+        return None
+
+def _patch_detection_vram_release():
+    """CRAFT's test_net leaves intermediate activations in the CUDA caching
+    allocator between calls, which reads as a steady VRAM leak across pages.
+    Wrap it once so the cache is handed back after every detection pass."""
+    import torch
+    import easyocr.detection as detection
+    if getattr(detection.test_net, '_releases_vram', False):
+        return
+    original_test_net = detection.test_net
+
+    def test_net(*args, **kwargs):
+        try:
+            return original_test_net(*args, **kwargs)
+        finally:
+            torch.cuda.empty_cache()
+
+    test_net._releases_vram = True
+    detection.test_net = test_net
+
+# The CRNN recognizer dominates OCR time and its LSTM/Linear layers
+# quantize well to int8 (VNNI GEMM on modern x86). Confidence scores can
+# shift slightly, so the flag allows opting out.
+OCR_QUANTIZE = os.environ.get('OCR_QUANTIZE', '1') != '0'
+
 @lru_cache(maxsize=3)
 def get_reader(languages, use_gpu=False):
     """Cached reader initialization for faster multi-run operations"""
-    return easyocr.Reader(
+    if use_gpu:
+        try:
+            import torch
+            # Fixed input sizes per run, so cudnn's kernel autotuner
+            # pays off; TF32 matmuls are safe for inference accuracy.
+            torch.backends.cudnn.benchmark = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.set_float32_matmul_precision('high')
+            _patch_detection_vram_release()
+        except Exception:
+            pass
+    reader = easyocr.Reader(
         languages,
         gpu=use_gpu,
         verbose=False,
-        model_storage_directory=None,
+        model_storage_directory=_ram_model_dir(),
         user_network_directory=None,
         recog_network='standard'
     )
+    if not use_gpu and OCR_QUANTIZE:
+        try:
+            import torch
+            reader.recognizer = torch.quantization.quantize_dynamic(
+                reader.recognizer,
+                {torch.nn.Linear, torch.nn.LSTM},
+                dtype=torch.qint8
+            )
+        except Exception:
+            pass
+    return reader
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def preprocess_image(image_path):
     """
-    Optimize image for OCR accuracy:
-    - Denoise using bilateral filter
-    - Enhance contrast using CLAHE
-    - Convert to grayscale
-    - Threshold for clarity
+    Optimize image for OCR speed and accuracy:
+    - Decode straight to grayscale (single channel - 3x less data)
+    - Enhance contrast using CLAHE on the gray plane
+
+    The old bilateral filter ran an O(r^2) weighted loop per pixel and was
+    ~10x slower than the rest of the pipeline combined; the recognizer
+    ingests grayscale anyway, so the 3-channel round-trip was wasted work.
     """
     try:
-        img = cv2.imread(image_path)
-        if img is None:
+        # imdecode on np.fromfile instead of imread: identical output but
+        # also survives unicode paths on Windows
+        gray = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             return None
-        
-        # 1. Denoise
-        img = cv2.bilateralFilter(img, 9, 75, 75)
-        
-        # 2. Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # 3. Enhance contrast using CLAHE
+
+        # Cap the long side at 1600px: CRAFT cost scales with pixel
+        # count, so a native-resolution phone photo is 4-16x the work
+        # for no recognition gain. INTER_AREA keeps strokes clean.
+        h, w = gray.shape[:2]
+        scale = 1600 / max(h, w)
+        if scale < 1:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                              interpolation=cv2.INTER_AREA)
+
+        # Enhance contrast using CLAHE (SIMD-accelerated, single plane).
+        # In-place via the out-param: no second image-sized allocation.
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
-        
-        # 4. Optional: Adaptive thresholding for very poor quality scans
-        # enhanced = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-        
+        enhanced = clahe.apply(gray, gray)
+
+        # Denoise only when the scan actually needs it: the Laplacian's
+        # std-dev is a cheap high-frequency noise estimate, and a 3x3
+        # median on noisy scans recovers most of what the old bilateral
+        # filter bought at a fraction of its cost. Clean scans skip it.
+        noise_level = cv2.meanStdDev(cv2.Laplacian(enhanced, cv2.CV_16S))[1][0][0]
+        if noise_level > 40:
+            enhanced = cv2.medianBlur(enhanced, 3)
+
+        # Optional: Otsu binarization for very poor quality scans
+        # _, enhanced = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
         return enhanced
     except Exception as e:
         log(f"Preprocess Warning: {str(e)} - using original image")
         return cv2.imread(image_path)
 
-def perform_ocr_parallel(image_path, use_gpu=False):
+def perform_ocr_parallel(image_path, use_gpu=False, full_scan=False):
     """
     Perform multilingual OCR in parallel:
     - Kannada + English
-    - Hindi + English
+    - Hindi + English (skipped for Latin-only content unless full_scan)
     - Merge results with deduplication
     """
     try:
@@ -81,35 +175,81 @@ def perform_ocr_parallel(image_path, use_gpu=False):
         processed_img = preprocess_image(image_path)
         if processed_img is None:
             raise ValueError(f"Invalid image file: {image_path}")
-        
+
         # Initialize readers (cached on second+ run)
         log("Process: Initializing Neural Core...")
-        reader_kn = get_reader(['kn', 'en'], use_gpu)
-        
-        log("Status: Scanning Kannada & English layers...")
-        results_kn = reader_kn.readtext(processed_img, detail=1, paragraph=True)
-        
-        # Extract text with confidence filtering (>0.3 threshold)
-        text_kn = []
-        for detection in results_kn:
-            text, confidence = detection[1], detection[2]
-            if confidence > 0.3:
-                text_kn.append(text)
-        
-        log("Status: Scanning Hindi layers...")
-        reader_hi = get_reader(['hi', 'en'], use_gpu)
-        results_hi = reader_hi.readtext(processed_img, detail=1, paragraph=True)
-        
-        text_hi = []
-        for detection in results_hi:
-            text, confidence = detection[1], detection[2]
-            if confidence > 0.3:
-                text_hi.append(text)
+        reader_kn = get_reader(('kn', 'en'), use_gpu)
+
+        # CRAFT detection is language-agnostic, so one detection pass
+        # feeds both recognizers instead of each readtext re-detecting
+        # the same boxes. Recognition is the per-language cost.
+        log("Status: Detecting text regions...")
+        # canvas_size matches the preprocess cap so CRAFT never
+        # re-upscales the already-downscaled image
+        horizontal_list, free_list = reader_kn.detect(processed_img,
+                                                      canvas_size=1600,
+                                                      mag_ratio=1.0)
+
+        def recognition_pass(reader):
+            """Recognize the shared boxes with confidence filtering (>0.3)"""
+            # paragraph=True would run EasyOCR's pairwise box-merging
+            # loop in pure Python (quadratic in detections) just for the
+            # geometry to be discarded below. Keep detections unmerged
+            # and restore reading order with one (y, x) sort instead.
+            results = reader.recognize(processed_img,
+                                       horizontal_list[0], free_list[0],
+                                       detail=1, paragraph=False)
+            # Vectorized confidence filter: one fromiter pass plus a
+            # numpy mask instead of a per-detection Python comparison -
+            # dense pages produce hundreds of boxes.
+            confidences = np.fromiter((d[2] for d in results),
+                                      dtype=np.float32, count=len(results))
+            accepted = [results[i] for i in np.nonzero(confidences > 0.3)[0]]
+            accepted.sort(key=lambda d: (min(p[1] for p in d[0]),
+                                         min(p[0] for p in d[0])))
+            return [d[1] for d in accepted]
+
+        if full_scan:
+            # Kannada and Devanagari recognizers cannot share one EasyOCR
+            # reader, but torch releases the GIL during inference - so the
+            # two passes run concurrently instead of back to back. Halve
+            # torch's intra-op threads on CPU so the two passes split the
+            # cores instead of each spawning a full-width OpenMP team.
+            reader_hi = get_reader(('hi', 'en'), use_gpu)
+            if not use_gpu:
+                try:
+                    import torch
+                    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+                except ImportError:
+                    pass
+            log("Status: Scanning Kannada, Hindi & English layers...")
+            future_kn = executor.submit(recognition_pass, reader_kn)
+            future_hi = executor.submit(recognition_pass, reader_hi)
+            text_kn = future_kn.result()
+            text_hi = future_hi.result()
+        else:
+            # Most uploads are English-only: run the Kannada+English pass
+            # first and invoke the Hindi reader only when the result
+            # actually contains a meaningful share of non-ASCII script.
+            log("Status: Scanning Kannada & English layers...")
+            text_kn = recognition_pass(reader_kn)
+            joined = ''.join(text_kn)
+            non_ascii_ratio = sum(1 for c in joined if ord(c) > 127) / max(1, len(joined))
+            if non_ascii_ratio < 0.05:
+                log("Status: Latin-only content - skipping Hindi pass")
+                text_hi = []
+            else:
+                log("Status: Scanning Hindi layer...")
+                text_hi = recognition_pass(get_reader(('hi', 'en'), use_gpu))
         
-        # Merge results: avoid duplicates by deduplication
+        # Merge results: set membership makes the dedup O(N+M) instead of
+        # rebuilding a stripped list per candidate (O(N*M))
+        seen = {t.strip() for t in text_kn}
         combined = text_kn.copy()
         for text in text_hi:
-            if text.strip() not in [t.strip() for t in combined]:
+            key = text.strip()
+            if key not in seen:
+                seen.add(key)
                 combined.append(text)
         
         log(f"Status: Extracted {len(combined)} text blocks")
@@ -119,6 +259,45 @@ def perform_ocr_parallel(image_path, use_gpu=False):
         log(f"OCR Error: {str(e)}")
         raise
 
+def serve_loop():
+    """
+    Warm-worker mode (--serve): import torch/easyocr and build both
+    readers once, then stream jobs from stdin as tab-separated
+    "input_path<TAB>output_path" lines, answering DONE/FAIL per job.
+
+    The per-invocation cold start (interpreter + torch + model load) is
+    several seconds and dwarfs the OCR itself on small images; a backend
+    that keeps one worker alive and pipes jobs in pays it exactly once.
+    """
+    use_gpu = False
+    try:
+        import torch
+        use_gpu = torch.cuda.is_available()
+    except Exception:
+        pass
+
+    log("Process: Warming OCR readers...")
+    get_reader(('kn', 'en'), use_gpu)
+    get_reader(('hi', 'en'), use_gpu)
+    log("READY")
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            input_path, output_path = line.split('\t', 1)
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(f"Input file not found: {input_path}")
+            # The warm worker has both readers loaded anyway, so it keeps
+            # the unconditional dual-pass behavior
+            extracted_text = perform_ocr_parallel(input_path, use_gpu, full_scan=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write("\n\n".join(extracted_text))
+            log(f"DONE {output_path}")
+        except Exception as e:
+            log(f"FAIL {type(e).__name__}: {str(e)}")
+
 def main():
     if len(sys.argv) < 3:
         log("Error: Missing parameters.")
@@ -126,6 +305,9 @@ def main():
 
     input_path = sys.argv[1]
     output_path = sys.argv[2]
+    # --full forces both language passes for callers that know the
+    # document mixes scripts
+    full_scan = '--full' in sys.argv[3:]
 
     try:
         # Validate input
@@ -145,7 +327,7 @@ def main():
             log("Process: CPU mode - using standard OCR")
 
         # Perform OCR
-        extracted_text = perform_ocr_parallel(input_path, use_gpu)
+        extracted_text = perform_ocr_parallel(input_path, use_gpu, full_scan)
 
         # Write results
         final_text = "\n\n".join(extracted_text)
@@ -164,4 +346,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve_loop()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import os
+import subprocess
+import tempfile
+
+# Shared LibreOffice invocation helper used by the document converters
+# (word_to_pdf.py, ppt_to_pdf.py). One place owns the headless flag set
+# and the throwaway-profile trick.
+
+# Naming the export filter outright skips LibreOffice's output-filter
+# negotiation pass for every conversion
+_PDF_FILTERS = {
+    '--writer': 'writer_pdf_Export',
+    '--impress': 'impress_pdf_Export',
+    '--calc': 'calc_pdf_Export',
+}
+
+def soffice_convert_cmd(input_path, output_dir, app_flag='--writer'):
+    """
+    Build a headless soffice command with a per-process user profile.
+
+    Keying the UserInstallation dir on the PID avoids the profile lock
+    that serializes concurrent soffice instances, while reusing the dir
+    across calls within a process skips LibreOffice's first-run profile
+    init (~300-800ms) on every launch after the first. The dir is left
+    behind for reuse; callers must not delete it.
+    """
+    profile_dir = os.path.join(tempfile.gettempdir(), f"LO_profile_{os.getpid()}")
+
+    if os.name == 'nt':
+        from urllib.request import pathname2url
+        uri = f"file:///{pathname2url(profile_dir)}"
+        exe = 'soffice'
+    else:
+        uri = f"file://{profile_dir}"
+        exe = 'libreoffice'
+
+    cmd = [
+        exe,
+        f'-env:UserInstallation={uri}',
+        '--headless',
+        '--nologo',
+        '--nodefault',
+        '--norestore',
+        app_flag,
+        '--convert-to', 'pdf:' + _PDF_FILTERS.get(app_flag, 'writer_pdf_Export'),
+        '--outdir', output_dir,
+        input_path
+    ]
+    return cmd, profile_dir
+
+class UnoService:
+    """Persistent LibreOffice listener shared across the converter
+    scripts (Word, Excel, PowerPoint inputs - the export filter picks
+    the document type).
+
+    Spawning soffice per conversion pays ~1-3s of UNO bootstrap every
+    time; an --accept listener pays it once and converts subsequent
+    documents in milliseconds. Only usable when the python-uno bindings
+    are present (bundled with LibreOffice); callers fall back to their
+    subprocess path otherwise.
+    """
+
+    PORT = 2002
+
+    @staticmethod
+    def ensure_listener():
+        """True if a listener already accepts on the socket; otherwise
+        spawn one detached so the NEXT invocation finds it warm."""
+        import socket
+        with socket.socket() as s:
+            s.settimeout(0.05)
+            if s.connect_ex(('127.0.0.1', UnoService.PORT)) == 0:
+                return True
+
+        exe = 'soffice' if os.name == 'nt' else 'libreoffice'
+        try:
+            subprocess.Popen(
+                [exe, '--headless', '--nologo', '--norestore',
+                 f"--accept=socket,host=127.0.0.1,port={UnoService.PORT};urp;"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError:
+            pass
+        return False
+
+    @staticmethod
+    def convert(input_path, output_path, filter_name='writer_pdf_Export'):
+        """Drive the warm listener via python-uno; True on success"""
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name = name
+            p.Value = value
+            return p
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx)
+        ctx = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={UnoService.PORT};urp;"
+            "StarOffice.ComponentContext")
+        desktop = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", ctx)
+
+        doc = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(input_path), "_blank", 0,
+            (prop("Hidden", True), prop("ReadOnly", True)))
+        try:
+            doc.storeToURL(uno.systemPathToFileUrl(output_path),
+                           (prop("FilterName", filter_name),))
+        finally:
+            doc.close(False)
+        try:
+            return os.stat(output_path).st_size > 100
+        except OSError:
+            return False
@@ -1,10 +1,13 @@
 import os
 import sys
+import tempfile
 import zipfile
 from pdf2image import convert_from_path
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def main():
@@ -19,30 +22,37 @@ def main():
     log(f"Process: Initializing Rendering Engine at {dpi} DPI...")
 
     try:
-        # 1. Convert PDF pages to list of PIL images
-        # thread_count=4 speeds up rendering on multi-core CPUs
-        pages = convert_from_path(input_path, dpi=dpi, thread_count=4)
-        
-        image_paths = []
-        log(f"Process: Rasterizing {len(pages)} pages...")
-
-        for i, page in enumerate(pages):
-            img_name = f"page_{i+1}.jpg"
-            img_path = os.path.join(output_dir, img_name)
-            
-            # Save as high-quality JPG
-            page.save(img_path, 'JPEG', quality=95)
-            image_paths.append(img_path)
-            log(f"Status: Rendered page {i+1}/{len(pages)}")
-
-        # 2. If multi-page, wrap in a ZIP for the user
-        zip_name = f"converted_images_{i+1}.zip"
-        zip_path = os.path.join(output_dir, zip_name)
-        
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for file in image_paths:
-                zipf.write(file, os.path.basename(file))
-                os.remove(file) # Clean up individual JPEGs
+        # 1. Render AND encode inside Poppler's threaded native path:
+        # with fmt/jpegopt/paths_only, each worker writes its page
+        # straight to JPEG in C, so Python never round-trips pixel
+        # buffers through PIL or serializes the encode loop.
+        log("Process: Rasterizing pages...")
+        with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+            image_paths = convert_from_path(
+                input_path,
+                dpi=dpi,
+                thread_count=os.cpu_count() or 4,
+                output_folder=tmp_dir,
+                fmt='jpeg',
+                jpegopt={'quality': 95, 'optimize': False},
+                paths_only=True
+            )
+            # convert_from_path already returns paths in page order, even
+            # threaded (each worker gets a sequential page range and the
+            # lists are concatenated in order). Do NOT sort: the filenames
+            # carry a random per-thread uuid prefix, so a lexicographic
+            # sort would interleave the threads' pages arbitrarily.
+            log(f"Status: Rendered {len(image_paths)} pages")
+
+            # 2. Wrap in a ZIP for the user. JPEG data is already
+            # compressed, so ZIP_STORED skips a deflate pass that would
+            # burn CPU for zero size reduction.
+            zip_name = f"converted_images_{len(image_paths)}.zip"
+            zip_path = os.path.join(output_dir, zip_name)
+
+            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as zipf:
+                for i, img_path in enumerate(image_paths):
+                    zipf.write(img_path, f"page_{i+1}.jpg")
 
         log(f"Success: ZIP archive created.")
         # We print the final filename so Node.js knows what to serve
@@ -1,47 +1,96 @@
 import os
+import subprocess
 import sys
-import comtypes.client
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
-def main():
-    if len(sys.argv) < 3:
-        sys.exit(1)
+def convert_with_soffice(input_path, output_path):
+    """
+    Headless LibreOffice export - no COM server launch, works without
+    Office installed, and typically several times faster for a one-shot
+    conversion. Returns True on success.
+    """
+    from office_engine import soffice_convert_cmd
 
-    # Use absolute paths - critical for Windows COM
-    input_path = os.path.abspath(sys.argv[1])
-    output_path = os.path.abspath(sys.argv[2])
+    output_dir = os.path.dirname(output_path)
+    # The profile dir persists for reuse - soffice_convert_cmd owns it
+    cmd, _profile_dir = soffice_convert_cmd(input_path, output_dir, app_flag='--impress')
+
+    try:
+        proc = subprocess.run(cmd, timeout=60, capture_output=True)
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return False
 
-    log("Process: Launching PowerPoint Virtual Engine...")
+    if proc.returncode != 0:
+        return False
+
+    # LibreOffice names the output after the input file
+    produced = os.path.join(
+        output_dir, os.path.splitext(os.path.basename(input_path))[0] + '.pdf')
+    try:
+        if os.stat(produced).st_size <= 100:
+            return False
+    except OSError:
+        return False
+    if produced != output_path:
+        os.replace(produced, output_path)
+    return True
+
+def convert_with_powerpoint(input_path, output_path):
+    """High-fidelity fallback via the PowerPoint COM server (Windows only)"""
+    import comtypes.client
 
-    # Initialize PowerPoint COM object
     powerpoint = None
     try:
         powerpoint = comtypes.client.CreateObject("Powerpoint.Application")
         # Keep it hidden
-        powerpoint.Visible = 1 
+        powerpoint.Visible = 1
 
         log("Process: Indexing slides and master layouts...")
-        
+
         # Open the presentation
         # 1: ReadOnly, 0: Untitled, 0: WithWindow
         deck = powerpoint.Presentations.Open(input_path, 1, 0, 0)
-        
+
         # FormatType 32 = PDF
         deck.SaveAs(output_path, 32)
         deck.Close()
-        
-        log("Success: PPT converted to PDF.")
-        sys.exit(0)
+        return True
+    finally:
+        if powerpoint:
+            powerpoint.Quit()
+
+def main():
+    if len(sys.argv) < 3:
+        sys.exit(1)
+
+    # Use absolute paths - critical for Windows COM
+    input_path = os.path.abspath(sys.argv[1])
+    output_path = os.path.abspath(sys.argv[2])
+
+    try:
+        # LibreOffice first: skips the multi-second PowerPoint COM
+        # launch and also covers machines without Office.
+        log("Process: Launching Presentation Engine...")
+        if convert_with_soffice(input_path, output_path):
+            log("Success: PPT converted to PDF.")
+            sys.exit(0)
+
+        log("Process: Falling back to PowerPoint Virtual Engine...")
+        if os.name == 'nt' and convert_with_powerpoint(input_path, output_path):
+            log("Success: PPT converted to PDF.")
+            sys.exit(0)
+
+        log("Critical Error: No available conversion engine succeeded")
+        sys.exit(1)
 
     except Exception as e:
         log(f"Critical Error: {str(e)}")
         sys.exit(1)
-    finally:
-        if powerpoint:
-            powerpoint.Quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
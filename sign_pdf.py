@@ -14,9 +14,19 @@ except ImportError:
     sys.exit(7)
 
 def log(message):
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
+# Map font styles to PyMuPDF fonts (module scope - built once, not per call)
+FONT_MAP = {
+    "script": "tibi",      # Times Bold Italic for elegant script look
+    "modern": "tibo",      # Times Bold
+    "classic": "tiit",     # Times Italic
+    "formal": "tiro"       # Times Regular
+}
+
 def main():
     try:
         if len(sys.argv) < 11:
@@ -36,14 +46,7 @@ def main():
         # Convert hex color to RGB (0-1 range)
         rgb = tuple(int(color_hex[i:i+2], 16) / 255 for i in (0, 2, 4))
         
-        # Map font styles to PyMuPDF fonts
-        font_map = {
-            "script": "tibi",      # Times Bold Italic for elegant script look
-            "modern": "tibo",      # Times Bold
-            "classic": "tiit",     # Times Italic
-            "formal": "tiro"       # Times Regular
-        }
-        selected_font = font_map.get(font_style, "tibi")
+        selected_font = FONT_MAP.get(font_style, "tibi")
 
         if not os.path.exists(input_pdf):
             sys.exit(1)
@@ -51,23 +54,26 @@ def main():
         doc = fitz.open(input_pdf)
         total_pages = len(doc)
         
-        target_indices = []
+        # Lazy index sources: ranges are pre-clamped to the document, so
+        # nothing is materialized even for "all" on thousand-page docs;
+        # only the comma form can still produce out-of-range indices.
         if page_range.lower() == "all":
-            target_indices = list(range(total_pages))
+            target_indices = range(total_pages)
         elif "-" in page_range:
-            parts = page_range.split("-")
-            target_indices = list(range(int(parts[0])-1, min(int(parts[1]), total_pages)))
+            lo, hi = page_range.split("-", 1)
+            target_indices = range(max(0, int(lo) - 1), min(int(hi), total_pages))
         else:
-            target_indices = [int(p.strip()) - 1 for p in page_range.split(",") if p.strip().isdigit()]
+            target_indices = (int(p.strip()) - 1 for p in page_range.split(",") if p.strip().isdigit())
+
+        # Calculate text dimensions once - name, font and size are the
+        # same on every page
+        text_len = fitz.get_text_length(name, fontname=selected_font, fontsize=font_size)
 
         for p_idx in target_indices:
             if 0 <= p_idx < total_pages:
                 page = doc[p_idx]
                 page_rect = page.rect
-                
-                # Calculate text dimensions
-                text_len = fitz.get_text_length(name, fontname=selected_font, fontsize=font_size)
-                
+
                 # Position calculation (convert from bottom-left to PyMuPDF coordinates)
                 safe_x = max(10, min(margin_x, page_rect.width - text_len - 10))
                 safe_y = max(font_size + 10, min(page_rect.height - margin_y, page_rect.height - 10))
@@ -79,8 +85,10 @@ def main():
                                 fontname=selected_font, 
                                 overlay=True)
 
-        # Save with optimization
-        doc.save(output_pdf, garbage=4, deflate=True)
+        # Save with optimization. Adding text overlays creates no
+        # orphaned objects, so the full garbage=4 dedup/compaction pass
+        # is wasted work here - level 1 just drops unreferenced objects.
+        doc.save(output_pdf, garbage=1, deflate=True, clean=False)
         doc.close()
         
         log("Success: PDF Signed with Style")
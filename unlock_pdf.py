@@ -4,7 +4,9 @@ import pikepdf
 
 def log(message):
     """Sends real-time updates to Node.js backend"""
-    print(message)
+    # One write() per line instead of print's two; the flush stays
+    # so the backend sees progress in real time
+    sys.stdout.write(f"{message}\n")
     sys.stdout.flush()
 
 def main():
@@ -20,15 +22,33 @@ def main():
     log("Process: Initializing Decryption Engine...")
 
     try:
-        # 1. Attempt to open with password
+        # 1. Attempt to open with password. mmap access lets the kernel
+        # page the file in on demand instead of slurping it whole.
         log("Process: Authenticating security credentials...")
-        with pikepdf.open(input_path, password=password) as pdf:
-            
+        with pikepdf.open(input_path, password=password,
+                          access_mode=pikepdf.AccessMode.mmap) as pdf:
+
             # 2. Check if the PDF was actually encrypted
             log("Process: Stripping encryption headers and restrictions...")
-            
-            # 3. Save as a new file (unencrypted by default)
-            pdf.save(output_path)
+
+            # 3. Save as a new file (unencrypted by default). Decryption
+            # only needs the security handler gone - keep the existing
+            # (already compressed) streams and object-stream layout
+            # instead of re-deflating every content stream.
+            # normalize_content / fix_metadata_version are extra passes
+            # over content streams and XMP that a decrypt-only rewrite
+            # doesn't need; their fixed cost dominates on small files.
+            # The 1 MiB write buffer batches QPDF's many small writes
+            # into few syscalls - noticeable on 100+ MB scans.
+            with open(output_path, 'wb', buffering=1 << 20) as out:
+                pdf.save(
+                    out,
+                    compress_streams=False,
+                    recompress_flate=False,
+                    normalize_content=False,
+                    fix_metadata_version=False,
+                    object_stream_mode=pikepdf.ObjectStreamMode.preserve
+                )
             
         log("Success: PDF unlocked and restrictions removed.")
         sys.exit(0)
@@ -34,36 +34,100 @@ class SystemKernel:
         except:
             pass 
 
+    _EXE_CACHE = {}
+
+    @staticmethod
+    def resolve_exe(name):
+        """Absolute executable path via a cached which() lookup - an
+        absolute path lets CPython spawn without a per-call PATH search.
+        Returns None when the binary isn't installed at all."""
+        if name not in SystemKernel._EXE_CACHE:
+            import shutil
+            SystemKernel._EXE_CACHE[name] = shutil.which(name)
+        return SystemKernel._EXE_CACHE[name]
+
+    @staticmethod
+    def kill_tree(proc):
+        """Terminating just the racer leaves its children alive -
+        soffice forks a soffice.bin that survives SIGTERM on the parent
+        and keeps holding the profile dir and memory. Kill the whole
+        process group (racers are spawned as group leaders)."""
+        try:
+            if os.name == 'nt':
+                subprocess.run(
+                    ['taskkill', '/F', '/T', '/PID', str(proc.pid)],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                import signal
+                os.killpg(proc.pid, signal.SIGKILL)
+        except (OSError, ProcessLookupError):
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    @staticmethod
+    def file_size(path):
+        """One stat() instead of exists()+getsize() - the checks run
+        inside the winner-poll loop, so syscalls per check matter"""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return -1
+
+    @staticmethod
+    def wait_process(proc, cancel_event):
+        """Block until proc exits (True) or cancel_event fires (False).
+
+        On Linux a pidfd becomes readable exactly when the child exits,
+        so the racer thread sleeps in poll() instead of waking every
+        10ms; the poll timeout exists only to notice cancellation.
+        Platforms without pidfd fall back to the micro-poll loop."""
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except OSError:
+                pidfd = None
+            if pidfd is not None:
+                import select
+                try:
+                    poller = select.poll()
+                    poller.register(pidfd, select.POLLIN)
+                    while proc.poll() is None:
+                        if cancel_event.is_set():
+                            return False
+                        poller.poll(200)
+                    return True
+                finally:
+                    os.close(pidfd)
+
+        if os.name == 'nt':
+            # Process handles are waitable kernel objects; 200ms slices
+            # keep cancellation responsive without a 10ms spin
+            import ctypes
+            handle = int(proc._handle)
+            while proc.poll() is None:
+                if cancel_event.is_set():
+                    return False
+                ctypes.windll.kernel32.WaitForSingleObject(handle, 200)
+            return True
+
+        delay = POLL_INTERVAL
+        while proc.poll() is None:
+            if cancel_event.is_set():
+                return False
+            time.sleep(delay)
+            # Geometric backoff: fast exits are caught within ms, long
+            # runs settle at a 200ms cadence instead of a 10ms spin
+            delay = min(0.2, delay * 1.5)
+        return True
+
     @staticmethod
     def get_fast_libreoffice_cmd(input_path, output_dir):
         """Generates the optimized command with RAM-disk profile"""
-        # Lazy imports for speed
-        import tempfile
-        import uuid
-        
-        profile_dir = os.path.join(tempfile.gettempdir(), f"LO_{uuid.uuid4().hex[:8]}")
-        
-        if os.name == 'nt':
-            from urllib.request import pathname2url
-            uri = f"file:///{pathname2url(profile_dir)}"
-            exe = 'soffice'
-        else:
-            uri = f"file://{profile_dir}"
-            exe = 'libreoffice'
-
-        cmd = [
-            exe,
-            f'-env:UserInstallation={uri}', 
-            '--headless',
-            '--nologo',       
-            '--nodefault',    
-            '--norestore',    
-            '--writer',
-            '--convert-to', 'pdf',
-            '--outdir', output_dir,
-            input_path
-        ]
-        return cmd, profile_dir
+        # Lazy import for speed; shared with ppt_to_pdf.py
+        from office_engine import soffice_convert_cmd
+        return soffice_convert_cmd(input_path, output_dir, app_flag='--writer')
 
 class ConversionRacer(threading.Thread):
     def __init__(self, name, target_func, args, success_event, result_holder):
@@ -73,7 +137,7 @@ class ConversionRacer(threading.Thread):
         self.args = args
         self.success_event = success_event
         self.result_holder = result_holder
-        self.process = None 
+        self.process = None
 
     def run(self):
         try:
@@ -82,36 +146,93 @@ class ConversionRacer(threading.Thread):
             pass
 
 class EngineLogic:
+    _WORD_APP = None
+
+    @staticmethod
+    def get_word_app():
+        """Reuse a live Word.Application; configure the speed options
+        only on a fresh launch. Word is deliberately never Quit() so the
+        next invocation's GetActiveObject finds it warm instead of
+        paying the multi-second launch again."""
+        import win32com.client
+
+        if EngineLogic._WORD_APP is not None:
+            return EngineLogic._WORD_APP
+
+        try:
+            word = win32com.client.GetActiveObject("Word.Application")
+        except Exception:
+            word = win32com.client.Dispatch("Word.Application")
+            word.Visible = False
+            word.DisplayAlerts = False
+            # SPEED TWEAK: Disable background tasks
+            word.Options.CheckSpellingAsYouType = False
+            word.Options.CheckGrammarAsYouType = False
+            word.Options.Pagination = False
+            word.ScreenUpdating = False
+
+        EngineLogic._WORD_APP = word
+        return word
+
     @staticmethod
     def run_subprocess(racer_obj):
         cmd = racer_obj.args['cmd']
         output_path = racer_obj.args['output_path']
         
+        exe = cmd[0] if os.path.isabs(cmd[0]) else SystemKernel.resolve_exe(cmd[0])
+        if exe is None:
+            # Binary not installed - bow out instead of spawning a
+            # doomed racer that fails and still consumes race attention
+            return
+        cmd = [exe] + list(cmd[1:])
+
         startupinfo = None
+        popen_kwargs = {}
         if os.name == 'nt':
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
+            # Own process group so taskkill /T can reap the whole tree
+            popen_kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # close_fds=False lets CPython take the posix_spawn (vfork)
+            # fast path instead of fork()ing a copy of this parent's
+            # page tables - safe here, only DEVNULL handles are passed.
+            popen_kwargs['close_fds'] = False
+            # Group leader, so kill_tree's killpg reaps soffice.bin
+            # grandchildren too (3.11+ keeps posix_spawn with setsid)
+            popen_kwargs['start_new_session'] = True
+
         racer_obj.process = subprocess.Popen(
             cmd,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
-            startupinfo=startupinfo
+            startupinfo=startupinfo,
+            **popen_kwargs
         )
         
-        # Micro-polling loop
-        while racer_obj.process.poll() is None:
-            if racer_obj.success_event.is_set():
-                racer_obj.process.terminate()
-                return
-            time.sleep(POLL_INTERVAL)
-            
+        # Event-driven wait: wakes when the child actually exits
+        # instead of on a timer
+        if not SystemKernel.wait_process(racer_obj.process, racer_obj.success_event):
+            SystemKernel.kill_tree(racer_obj.process)
+            return
+
         # Post-process check
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 100:
+        if SystemKernel.file_size(output_path) > 100:
             if not racer_obj.success_event.is_set():
                 racer_obj.result_holder['winner'] = racer_obj.name
                 racer_obj.success_event.set()
 
+    @staticmethod
+    def run_libreoffice(racer_obj):
+        """Build the soffice command inside the racer thread so the
+        profile-dir setup overlaps the other engines' startup instead
+        of sitting serially on the critical path before the race."""
+        # The per-process profile dir is reused across runs, not cleaned
+        cmd, _profile_dir = SystemKernel.get_fast_libreoffice_cmd(
+            racer_obj.args['input_path'], racer_obj.args['output_dir'])
+        racer_obj.args['cmd'] = cmd
+        EngineLogic.run_subprocess(racer_obj)
+
     @staticmethod
     def run_com_automation(racer_obj):
         if os.name != 'nt': return
@@ -121,29 +242,18 @@ class EngineLogic:
         
         # Lazy import COM libraries only inside the thread
         import pythoncom
-        import win32com.client
-        
+
         pythoncom.CoInitialize()
-        
+
         try:
-            try:
-                word = win32com.client.GetActiveObject("Word.Application")
-            except:
-                word = win32com.client.Dispatch("Word.Application")
-                word.Visible = False
-                word.DisplayAlerts = False
-                # SPEED TWEAK: Disable background tasks
-                word.Options.CheckSpellingAsYouType = False
-                word.Options.CheckGrammarAsYouType = False
-                word.Options.Pagination = False
-                word.ScreenUpdating = False
-            
+            word = EngineLogic.get_word_app()
+
             # Open Read-Only for speed
             doc = word.Documents.Open(input_path, ReadOnly=True, Visible=False)
             doc.SaveAs(output_path, FileFormat=17) # 17 = PDF
             doc.Close(SaveChanges=False)
             
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 100:
+            if SystemKernel.file_size(output_path) > 100:
                 if not racer_obj.success_event.is_set():
                     racer_obj.result_holder['winner'] = "Word-COM"
                     racer_obj.success_event.set()
@@ -153,6 +263,16 @@ class EngineLogic:
             pythoncom.CoUninitialize()
 
 def main():
+    # 0. Pre-warm the COM machinery off-thread on Windows: the
+    # pythoncom/win32com import costs 100-300ms cold and otherwise
+    # lands on the COM racer's critical path - and COM usually wins.
+    # sys.modules makes the racer's own import a dict lookup.
+    if os.name == 'nt':
+        threading.Thread(
+            target=lambda: __import__('win32com.client'),
+            daemon=True
+        ).start()
+
     # 1. Start Clock & Boost Priority immediately
     start_time = time.time()
     SystemKernel.boost_process_priority()
@@ -164,88 +284,109 @@ def main():
     output_path = os.path.abspath(sys.argv[2])
     output_dir = os.path.dirname(output_path)
 
-    # 2. Prepare Racers
+    # 1.5 Warm path: if the persistent UNO listener is up, convert in
+    # milliseconds and skip the race entirely. First invocation spawns
+    # the listener in the background and still races below.
+    try:
+        import uno  # noqa: F401 - only in LibreOffice-bundled pythons
+    except ImportError:
+        pass
+    else:
+        try:
+            from office_engine import UnoService
+            if UnoService.ensure_listener() and UnoService.convert(input_path, output_path):
+                print(f"Success: UNO-Warm won in {time.time() - start_time:.4f}s")
+                sys.exit(0)
+        except Exception:
+            pass
+
+    # 2. Prepare & start racers: each thread starts the moment it is
+    # built and does its own prep concurrently, so no engine's setup
+    # sits serially in front of another's on the critical path.
     success_event = threading.Event()
     result = {'winner': None}
     threads = []
-    temp_dirs_to_clean = []
 
-    # RACER 1: Windows Native COM (Optimized)
-    if os.name == 'nt':
+    # Skip racers that can't (or needn't) handle this format: spawning
+    # a doomed or redundant engine only adds tail latency and cleanup.
+    ext = os.path.splitext(input_path)[1].lower()
+    # pandoc has no reader for Word 97 binaries
+    use_pandoc = ext != '.doc'
+    # plain text and RTF don't need Word - pandoc/LibreOffice cover them
+    use_com = ext not in ('.txt', '.rtf')
+
+    # RACER 1: Windows Native COM (zero prep - dispatch first)
+    if os.name == 'nt' and use_com:
         t = ConversionRacer(
-            "Word-COM", 
-            EngineLogic.run_com_automation, 
+            "Word-COM",
+            EngineLogic.run_com_automation,
             {'input_path': input_path, 'output_path': output_path},
             success_event, result
         )
         threads.append(t)
+        t.start()
 
-    # RACER 2: LibreOffice (Profile Optimized)
-    lo_cmd, lo_profile = SystemKernel.get_fast_libreoffice_cmd(input_path, output_dir)
-    temp_dirs_to_clean.append(lo_profile)
-    
+    # RACER 2: LibreOffice (builds its profile + command in-thread)
     t = ConversionRacer(
         "LibreOffice",
-        EngineLogic.run_subprocess,
-        {'cmd': lo_cmd, 'output_path': output_path}, 
+        EngineLogic.run_libreoffice,
+        {'input_path': input_path, 'output_dir': output_dir, 'output_path': output_path},
         success_event, result
     )
     threads.append(t)
+    t.start()
 
     # RACER 3: Pandoc (Fallback)
-    t = ConversionRacer(
-        "Pandoc",
-        EngineLogic.run_subprocess,
-        {'cmd': ['pandoc', input_path, '-o', output_path, '--pdf-engine=wkhtmltopdf'], 'output_path': output_path},
-        success_event, result
-    )
-    threads.append(t)
+    if use_pandoc:
+        t = ConversionRacer(
+            "Pandoc",
+            EngineLogic.run_subprocess,
+            {'cmd': ['pandoc', input_path, '-o', output_path, '--pdf-engine=wkhtmltopdf'], 'output_path': output_path},
+            success_event, result
+        )
+        threads.append(t)
+        t.start()
 
-    # 3. Start Race
+    # 3. Race underway
     print(f"Status: Racing {len(threads)} engines...")
     sys.stdout.flush()
-    
-    for t in threads: t.start()
 
     # 4. Wait for Winner
     final_duration = 0
     lo_default_name = os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
     lo_default_path = os.path.join(output_dir, lo_default_name)
 
+    delay = 0.005
     while not success_event.is_set():
         if time.time() - start_time > TIMEOUT_SECONDS:
             break
         
-        # Check for LibreOffice misnamed file (Common LO quirk)
-        if os.path.exists(lo_default_path):
-            # Double check size to ensure write is done
-            if os.path.getsize(lo_default_path) > 100:
-                try:
-                    if os.path.exists(output_path): os.remove(output_path)
-                    os.rename(lo_default_path, output_path)
-                    result['winner'] = "LibreOffice-Detected"
-                    success_event.set()
-                except: pass
-            
-        time.sleep(POLL_INTERVAL)
+        # Check for LibreOffice misnamed file (Common LO quirk);
+        # size > 100 double-checks the write is done
+        if SystemKernel.file_size(lo_default_path) > 100:
+            try:
+                # os.replace is atomic on POSIX and Windows - no
+                # remove+rename window where neither file exists
+                os.replace(lo_default_path, output_path)
+                result['winner'] = "LibreOffice-Detected"
+                success_event.set()
+            except OSError: pass
+
+        # Event wait with geometric backoff: a winner wakes this loop
+        # immediately; the rename check starts at 5ms for the quick
+        # conversions and backs off to 200ms for the long ones
+        success_event.wait(delay)
+        delay = min(0.2, delay * 1.5)
 
     # 5. Capture Finish Time
     if success_event.is_set():
         final_duration = time.time() - start_time
 
-    # 6. Aggressive Cleanup
-    # Kill threads first
+    # 6. Aggressive Cleanup - kill racer trees; the LibreOffice profile
+    # dir is per-process and persists so the next run skips profile init
     for t in threads:
         if t.process:
-            try: t.process.kill() 
-            except: pass
-    
-    # Lazy import shutil only for cleanup
-    import shutil
-    if os.name == 'nt': time.sleep(0.1)
-    for path in temp_dirs_to_clean:
-        try: shutil.rmtree(path, ignore_errors=True)
-        except: pass
+            SystemKernel.kill_tree(t.process)
 
     # 7. Final Output
     if success_event.is_set() and os.path.exists(output_path):